@@ -1,12 +1,14 @@
+import math
+import os
+import platform
 import subprocess
 import shutil
 
 def run_command(command):
-    """Runs a shell command and returns its output."""
+    """Runs a command (given as an argument list) and returns its output."""
     try:
         result = subprocess.run(
             command,
-            shell=True,
             check=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -14,7 +16,24 @@ def run_command(command):
         )
         return result.stdout.strip()
     except (subprocess.CalledProcessError, FileNotFoundError) as e:
-        return f"Error running command '{command}': {e.stderr or str(e)}"
+        return f"Error running command '{' '.join(command)}': {getattr(e, 'stderr', None) or str(e)}"
+
+def read_key_values(path, sep):
+    """Parses a 'key<sep>value' file such as /proc/meminfo into a dict of first occurrences."""
+    info = {}
+    with open(path) as f:
+        for line in f:
+            key, found, value = line.partition(sep)
+            if found:
+                info.setdefault(key.strip(), value.strip().strip('"'))
+    return info
+
+def format_bytes(num_bytes):
+    """Formats a byte count the way `free -h`/`df -h` do (e.g. 15.5G)."""
+    for unit in ('B', 'K', 'M', 'G', 'T'):
+        if num_bytes < 1024 or unit == 'T':
+            return f"{num_bytes:.1f}{unit}"
+        num_bytes /= 1024
 
 def print_header(title):
     """Prints a formatted header."""
@@ -25,24 +44,47 @@ def print_header(title):
 def check_os():
     """Checks Operating System details."""
     print_header("Operating System")
-    # The lsb_release command may not be available
-    if shutil.which("lsb_release"):
-        os_info = run_command("lsb_release -a")
-    else:
-        os_info = run_command("cat /etc/os-release")
-    print(os_info)
+    try:
+        os_info = read_key_values("/etc/os-release", "=")
+    except OSError as e:
+        print(f"Could not read /etc/os-release: {e}")
+        return
+    print(f"Description:  {os_info.get('PRETTY_NAME', 'unknown')}")
+    print(f"Release:      {os_info.get('VERSION_ID', 'unknown')}")
+    print(f"Kernel:       {platform.release()}")
 
 def check_cpu():
     """Checks CPU details."""
     print_header("CPU Information")
-    cpu_info = run_command("lscpu | grep -E 'Model name|Core(s) per socket|Socket(s)|Architecture'")
-    print(cpu_info)
+    try:
+        cpu_info = read_key_values("/proc/cpuinfo", ":")
+        with open("/proc/cpuinfo") as f:
+            sockets = {line.partition(":")[2].strip() for line in f if line.startswith("physical id")}
+    except OSError as e:
+        print(f"Could not read /proc/cpuinfo: {e}")
+        return
+    print(f"Architecture:        {platform.machine()}")
+    print(f"Model name:          {cpu_info.get('model name', 'unknown')}")
+    print(f"Core(s) per socket:  {cpu_info.get('cpu cores', 'unknown')}")
+    print(f"Thread(s) per socket: {cpu_info.get('siblings', 'unknown')}")
+    print(f"Socket(s):           {len(sockets) or 1}")
 
 def check_ram():
     """Checks RAM details."""
     print_header("RAM Information")
-    ram_info = run_command("free -h")
-    print(ram_info)
+    try:
+        mem_info = read_key_values("/proc/meminfo", ":")
+    except OSError as e:
+        print(f"Could not read /proc/meminfo: {e}")
+        return
+    def kb(key):
+        # /proc/meminfo reports sizes in kB
+        return int(mem_info.get(key, '0').split()[0]) * 1024
+
+    print(f"Mem total:      {format_bytes(kb('MemTotal'))}")
+    print(f"Mem available:  {format_bytes(kb('MemAvailable'))}")
+    print(f"Swap total:     {format_bytes(kb('SwapTotal'))}")
+    print(f"Swap free:      {format_bytes(kb('SwapFree'))}")
 
 def check_gpu():
     """Checks for an NVIDIA GPU."""
@@ -52,14 +94,18 @@ def check_gpu():
         print("`nvidia-smi` command not found. No NVIDIA GPU detected or drivers are not installed.")
         return
 
-    gpu_info = run_command("nvidia-smi")
+    gpu_info = run_command(["nvidia-smi"])
     print(gpu_info)
 
 def check_disk():
     """Checks disk space."""
     print_header("Disk Space")
-    disk_info = run_command("df -h /") # Check the root filesystem
-    print(disk_info)
+    stats = os.statvfs("/") # Check the root filesystem
+    total = stats.f_blocks * stats.f_frsize
+    free = stats.f_bavail * stats.f_frsize
+    used = total - stats.f_bfree * stats.f_frsize
+    print(f"Size: {format_bytes(total)}  Used: {format_bytes(used)}  "
+          f"Avail: {format_bytes(free)}  Use%: {math.ceil(100 * used / (used + free))}%")  # Same formula and rounding as df
 
 if __name__ == "__main__":
     print("Gathering system specifications...")
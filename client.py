@@ -1,3 +1,4 @@
+import codecs
 import socket
 import cv2
 import numpy as np
@@ -11,11 +12,18 @@ def run_client():
     if not cap.isOpened():
         print("Error: Cannot open camera")
         return
+    # Keep only the newest frame in the driver queue and have the camera send MJPEG
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
     try:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             s.settimeout(5)  # 5-second timeout
+            s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Disable Nagle delay
             s.connect((SERVER_IP, PORT))
-            ret, frame = cap.read()
+            # Skip stale buffered frames without decoding them, then decode the newest
+            for _ in range(max(1, int(cap.get(cv2.CAP_PROP_BUFFERSIZE)))):
+                cap.grab()
+            ret, frame = cap.retrieve()
             if ret:
                 _, img_bytes = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
                 if img_bytes is not None:
@@ -25,9 +33,16 @@ def run_client():
                     print("Error: Failed to encode image")
             else:
                 print("Error: Failed to capture image")
-            data = s.recv(1024)
-            if data:
-                print(f"Received from server: {data.decode()}")
+            # The server streams the AI description as it is generated
+            print("Received from server: ", end='', flush=True)
+            # Incremental decoder so a UTF-8 character split across reads isn't mangled
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            while True:
+                data = s.recv(1024)
+                if not data:
+                    break
+                print(decoder.decode(data), end='', flush=True)
+            print(decoder.decode(b'', final=True))
     except (socket.timeout, ConnectionError) as e:
         print(f"Connection failed: {e}")
     finally:
@@ -1,9 +1,14 @@
 import requests
 import json
+from requests.adapters import HTTPAdapter
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
 MODEL = "phi3:mini"
 
+# Reuse one keep-alive connection to Ollama across queries
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+
 def query_llama(prompt):
     data = {
         "model": MODEL,
@@ -11,7 +16,7 @@ def query_llama(prompt):
         "stream": False
     }
     try:
-        response = requests.post(OLLAMA_URL, json=data)
+        response = SESSION.post(OLLAMA_URL, json=data)
         if response.status_code == 200:
             return response.json()["response"]
         else:
@@ -1,5 +1,5 @@
 import socket
-import json
+import orjson
 import time
 import logging
 
@@ -27,6 +27,7 @@ def send_handshake():
         # Create a TCP socket
         client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         client.settimeout(5.0)  # Timeout for connection attempts
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Disable Nagle delay
 
         # Connect to Xeon server
         logging.info(f"Connecting to {CONFIG['HOST']}:{CONFIG['PORT_HANDSHAKE']}...")
@@ -39,17 +40,15 @@ def send_handshake():
             'cameras': CONFIG['CAMERAS'],
             'timestamp': time.time()
         }
-        payload_bytes = json.dumps(payload).encode('utf-8')
+        payload_bytes = orjson.dumps(payload)
 
-        # Send payload length first (4 bytes, big-endian)
-        client.sendall(len(payload_bytes).to_bytes(4, byteorder='big'))
-        # Send the actual JSON payload
-        client.sendall(payload_bytes)
+        # Send payload length (4 bytes, big-endian) and JSON payload in one write
+        client.sendall(len(payload_bytes).to_bytes(4, byteorder='big') + payload_bytes)
         logging.info("Sent config payload to Xeon")
 
         # Wait for ACK from Xeon
         ack_bytes = client.recv(CONFIG['BUFFER_SIZE'])
-        ack = json.loads(ack_bytes.decode('utf-8'))
+        ack = orjson.loads(ack_bytes)
         logging.info(f"Received ACK: {ack}")
 
         # Check if ACK is valid and measure RTT
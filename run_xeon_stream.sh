@@ -0,0 +1,40 @@
+#!/bin/bash
+# Starts a Xeon stream receiver with the receive loop pinned to a core on the
+# same NUMA node (chiplet) as the NIC, and the NIC's interrupts steered there too.
+# Usage: sudo ./run_xeon_stream.sh [script] [interface]
+# Stop irqbalance first (sudo systemctl stop irqbalance) or it will undo the IRQ pinning.
+
+# --- Configuration ---
+SCRIPT=${1:-xeon_stream_depth.py}
+IFACE=${2:-eth0}
+
+# --- Pick cores on the NIC's NUMA node ---
+NUMA_NODE=$(cat /sys/class/net/$IFACE/device/numa_node 2>/dev/null || echo -1)
+if [ "$NUMA_NODE" -lt 0 ]; then
+  NUMA_NODE=0 # Single-node machine or virtual NIC
+fi
+NODE_CPULIST=$(cat /sys/devices/system/node/node$NUMA_NODE/cpulist)
+
+# Expand a cpulist like "0-3,8" into "0 1 2 3 8"
+CPUS=()
+for part in ${NODE_CPULIST//,/ }; do
+  CPUS+=($(seq ${part%-*} ${part#*-}))
+done
+
+IRQ_CPU=${CPUS[0]}     # NIC interrupts
+STREAM_CPU=${CPUS[1]:-${CPUS[0]}}  # Receive loop, shares the chiplet's cache with the IRQ core
+WEB_CPUS=$(IFS=,; echo "${CPUS[*]:2}")
+WEB_CPUS=${WEB_CPUS:-$NODE_CPULIST} # Flask and the rest of the node
+
+echo "NIC $IFACE is on NUMA node $NUMA_NODE (CPUs $NODE_CPULIST)"
+
+# --- Steer the NIC's RX queue interrupts to IRQ_CPU ---
+for irq in $(grep "$IFACE" /proc/interrupts | cut -d: -f1); do
+  if ! echo $IRQ_CPU > /proc/irq/$irq/smp_affinity_list 2>/dev/null; then
+    echo "Could not set affinity for IRQ $irq (run as root)"
+  fi
+done
+
+# --- Main Script ---
+echo "Starting $SCRIPT: receive loop on CPU $STREAM_CPU, IRQs on CPU $IRQ_CPU, web on CPUs $WEB_CPUS"
+STREAM_CPUS=$STREAM_CPU WEB_CPUS=$WEB_CPUS exec taskset -c $NODE_CPULIST python3 $SCRIPT
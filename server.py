@@ -1,48 +1,99 @@
-import socket
+import asyncio
 import base64
 import requests # You may need to run: pip install requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson # You may need to run: pip install orjson
+import os
 import sys
+import threading
+import cv2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 # --- Configuration ---
 HOST = '0.0.0.0'  # Listen on all available network interfaces
 PORT = 12345
 # This is the local URL for the Ollama service. It works since your terminal test passed.
 OLLAMA_API_URL = "http://localhost:11434/api/generate"
-
-def get_image_description(image_data):
-    """Sends image data to the local Ollama model and gets a description."""
+# Quantized moondream and the image size its vision encoder actually uses.
+MODEL_NAME = "moondream:1.8b-v2-q4_0"
+MODEL_INPUT_SIZE = (378, 378)
+# Set DEBUG_SAVE_IMAGES=1 to keep a copy of the last image sent to the AI.
+DEBUG_SAVE_IMAGES = bool(os.environ.get('DEBUG_SAVE_IMAGES'))
+
+# One keep-alive session so each request reuses the connection to Ollama
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+
+# Bounded pool for AI requests; extra clients queue here instead of blocking accept()
+AI_POOL = ThreadPoolExecutor(max_workers=4)
+
+def shrink_image(image_data):
+    """Downscales the image to the model's input size so less is uploaded and encoded."""
+    frame = cv2.imdecode(np.frombuffer(image_data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        return image_data # Not an image OpenCV can read, send it unchanged
+    small = cv2.resize(frame, MODEL_INPUT_SIZE, interpolation=cv2.INTER_AREA)
+    ret, jpeg = cv2.imencode('.jpg', small, [cv2.IMWRITE_JPEG_QUALITY, 70])
+    return jpeg if ret else image_data
+
+def get_image_description(image_data, on_text=None):
+    """
+    Sends image data to the local Ollama model and gets a description.
+    The reply is streamed; each piece of text is passed to on_text as it
+    arrives, and generation stops early if on_text returns False.
+    """
     # Don't print for warm-up, only for real requests.
     if len(image_data) > 100: # The dummy image is very small
       print("Asking AI for a description...")
 
     try:
-        # Encode the binary image data into a base64 string, required by the API
-        base64_image = base64.b64encode(image_data).decode('utf-8')
+        # Shrink the image, then encode it into a base64 string, required by the API
+        base64_image = base64.b64encode(shrink_image(image_data)).decode('utf-8')
 
         # Prepare the data payload for the Ollama API
-        payload = {
+        payload = orjson.dumps({
             # *** EDITED: Switched to 'moondream', a smaller, RAM-friendly vision model. ***
-            "model": "moondream", # The vision model
+            "model": MODEL_NAME, # The vision model
             "prompt": "Describe what you see in this image in one short sentence.",
-            "stream": False,
-            "images": [base64_image]
-        }
+            "stream": True, # Receive tokens as they are generated
+            "images": [base64_image],
+            "options": {"num_gpu": 999} # Offload every layer to the GPU
+        })
 
         # Send the request to the Ollama server
         # *** EDITED: Increased timeout from 60s to 300s to give the AI more time. ***
-        response = requests.post(OLLAMA_API_URL, json=payload, timeout=300)
-        response.raise_for_status() # This will raise an error for bad responses (like 404 or 500)
-
-        # Parse the JSON response and return the description
-        response_data = response.json()
-        return response_data.get('response', 'AI could not provide a description.').strip()
+        description = []
+        with SESSION.post(OLLAMA_API_URL, data=payload, stream=True,
+                          headers={'Content-Type': 'application/json'}, timeout=300) as response:
+            response.raise_for_status() # This will raise an error for bad responses (like 404 or 500)
+
+            # Each line of the streamed response is a JSON chunk with the next piece of text
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                text = chunk.get('response', '')
+                if text:
+                    description.append(text)
+                    if on_text is not None and on_text(text) is False:
+                        break # Client went away, stop generating
+                if chunk.get('done'):
+                    break
+
+        return ''.join(description).strip() or 'AI could not provide a description.'
 
     except requests.exceptions.RequestException as e:
         print(f"Error communicating with Ollama AI: {e}")
-        print("Please ensure the Ollama service/docker is running and you have the 'moondream' model installed (`ollama pull moondream`).")
+        print(f"Please ensure the Ollama service/docker is running and you have the '{MODEL_NAME}' model installed (`ollama pull {MODEL_NAME}`).")
         return "Could not connect to the AI service."
 
+def save_image(image_data):
+    """Writes the received image to disk for debugging."""
+    with open('received_image.jpg', 'wb') as f:
+        f.write(image_data)
+    print("Image saved as received_image.jpg")
+
 def warm_up_ai():
     """
     Sends a dummy request to the AI model to force it to load into memory
@@ -65,40 +116,61 @@ def warm_up_ai():
         print("✅ AI model is warmed up and ready.")
 
 
-def handle_client(conn, addr):
+async def handle_client(reader, writer):
     """Handles a single client connection."""
+    addr = writer.get_extra_info('peername')
     print(f"Connected by {addr}")
+    # asyncio already enables TCP_NODELAY on its TCP transports.
     try:
         # 1. Send the command to the client
         print("Sending 'CAPTURE' command to client...")
-        conn.sendall(b'CAPTURE')
+        writer.write(b'CAPTURE')
+        await writer.drain()
 
         # 2. Receive the image size (4 bytes)
-        image_size_bytes = conn.recv(4)
-        if not image_size_bytes:
+        try:
+            image_size_bytes = await reader.readexactly(4)
+        except asyncio.IncompleteReadError:
             raise ConnectionError("Client disconnected before sending image size.")
         image_size = int.from_bytes(image_size_bytes, 'big')
         
         print(f"Expecting image of size: {image_size} bytes")
 
-        # 3. Receive the image data
-        image_data = b''
-        while len(image_data) < image_size:
-            packet = conn.recv(4096)
-            if not packet:
-                raise ConnectionError("Client disconnected during image transfer.")
-            image_data += packet
+        # 3. Receive the image data (other clients are served while we wait)
+        try:
+            image_data = await reader.readexactly(image_size)
+        except asyncio.IncompleteReadError:
+            raise ConnectionError("Client disconnected during image transfer.")
         
         print("Image received successfully.")
 
         # This lets you see the exact image the AI is analyzing.
-        with open('received_image.jpg', 'wb') as f:
-            f.write(image_data)
-        print("Image saved as received_image.jpg")
+        # Written on a background thread to keep disk I/O off the request path.
+        if DEBUG_SAVE_IMAGES:
+            threading.Thread(target=save_image, args=(image_data,), daemon=True).start()
         
         # --- AI SECTION ---
-        # 4. Get the description from the AI
-        description = get_image_description(image_data)
+        # 4. Get the description from the AI on the worker pool so the
+        #    server keeps accepting connections during the (slow) AI call
+        #    Partial text is forwarded to the client as soon as it is generated.
+        loop = asyncio.get_running_loop()
+
+        async def write_partial(data):
+            # Runs on the event loop, so transport state is only touched there
+            if writer.is_closing():
+                return False
+            writer.write(data)
+            try:
+                await writer.drain() # Back-pressure: a slow client slows generation instead of buffering
+            except ConnectionError:
+                return False
+            return True
+
+        def send_partial(text):
+            # Called on the AI worker thread; blocks until the text is flushed
+            return asyncio.run_coroutine_threadsafe(write_partial(text.encode('utf-8')), loop).result()
+
+        description = await loop.run_in_executor(AI_POOL, get_image_description, image_data, send_partial)
         
         # 5. Print the result
         print("\n========================================")
@@ -106,7 +178,8 @@ def handle_client(conn, addr):
         print("========================================\n")
         
         # 6. Send a new confirmation back to the client
-        conn.sendall(b'Image received and analyzed by AI')
+        writer.write(b'\nImage received and analyzed by AI')
+        await writer.drain()
 
     except ConnectionError as e:
         print(f"Error: {e}")
@@ -114,24 +187,20 @@ def handle_client(conn, addr):
         print(f"An unexpected error occurred with {addr}: {e}")
     finally:
         print(f"Closing connection with {addr}")
-        conn.close()
+        writer.close()
+
+async def serve():
+    """Accepts client connections concurrently."""
+    # reuse_address allows the socket to be reused immediately after the script closes.
+    server = await asyncio.start_server(handle_client, HOST, PORT, reuse_address=True)
+    print(f"Server listening on port {PORT}...")
+    async with server:
+        await server.serve_forever()
 
 def main():
-    """Main loop to listen for incoming connections."""
+    """Warms up the AI, then listens for incoming connections."""
     warm_up_ai() # Load the model before starting the server
-
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        # This allows the socket to be reused immediately after the script closes.
-        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        
-        s.bind((HOST, PORT))
-        s.listen()
-        print(f"Server listening on port {PORT}...")
-        
-        while True:
-            # Wait for a client to connect
-            conn, addr = s.accept()
-            handle_client(conn, addr)
+    asyncio.run(serve())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,11 +1,13 @@
 import socket
+import select
 import cv2
 import numpy as np
 import logging
 import struct
 import time
-from flask import Flask, Response
-from threading import Thread, Lock
+import shutil
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread, Lock, Condition
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -14,71 +16,168 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 CONFIG = {
     'HOST': '',               # Bind to all interfaces for TCP
     'PORT_STREAM': 5001,      # Port for video stream
-    'BUFFER_SIZE': 4096,      # Socket buffer size
     'FRAME_TIMEOUT': 1.0,     # Seconds before dropping frame
-    'WEB_PORT': 8080,         # Port for Flask web server
+    'WEB_PORT': 8080,         # Port for MJPEG web server
+    'DROP_LOG_INTERVAL': 5.0, # Seconds between dropped-frame reports
+    'MAX_DRAIN': 8,           # Most queued frames skipped per processed frame
+    'JPEG_QUALITY': 80,       # JPEG quality for the MJPEG web stream
     'EXPECTED_CAMERA': 0       # Single camera index
 }
 
-# Initialize Flask app
-app = Flask(__name__)
-
-# Store latest frame and edges in memory with thread-safe lock
-latest_frame = None
-latest_edges = None
+# Store latest JPEG-encoded frame and edges in memory with thread-safe lock
+latest_frame_jpeg = None
+latest_edges_jpeg = None
+edge_viewers = 0  # Open /video_feed/edges streams; edges are skipped while zero
 frame_lock = Lock()
+frame_ready = Condition(frame_lock)  # Notified whenever new JPEGs are cached
+
+# Frame header (cam_id, frame_size), parsed from a reusable buffer
+HEADER = struct.Struct('!II')
+header_buf = bytearray(HEADER.size)
+header_view = memoryview(header_buf)
+# JPEG receive buffer reused across frames, replaced only when a larger frame arrives
+frame_buf = bytearray(64 * 1024)
+
+# Use nvJPEG for JPEG decode/encode when an NVIDIA GPU is present
+nvjpeg = None
+if shutil.which('nvidia-smi'):
+    try:
+        from nvjpeg import NvJpeg  # pip install pynvjpeg
+        nvjpeg = NvJpeg()
+        logging.info("NVIDIA GPU found, using nvJPEG for JPEG decode/encode")
+    except Exception as e:
+        logging.warning(f"nvJPEG unavailable, falling back to OpenCV: {e}")
+
+# Run grayscale conversion + Canny on the GPU when OpenCV is built with CUDA
+gpu_canny = None
+if cv2.cuda.getCudaEnabledDeviceCount() > 0:
+    gpu_frame = cv2.cuda_GpuMat()  # Reused across frames to avoid reallocating
+    gpu_canny = cv2.cuda.createCannyEdgeDetector(100, 200)
+    logging.info("CUDA device found, running Canny on the GPU")
+
+def decode_jpeg(frame_data):
+    """Decodes JPEG bytes to a BGR image, on the GPU when nvJPEG is available."""
+    if nvjpeg is not None:
+        return nvjpeg.decode(bytes(frame_data))
+    frame_array = np.frombuffer(frame_data, dtype=np.uint8)
+    return cv2.imdecode(frame_array, cv2.IMREAD_COLOR)
 
-def receive_frame(client):
-    """Receives a frame with header (cam_id, frame_size) and decodes it."""
+def receive_payload(client):
+    """
+    Receives a frame with header (cam_id, frame_size) without decoding it.
+    Returns (cam_id, payload); payload is a view into the shared receive
+    buffer that the next call overwrites.
+    """
+    global frame_buf
     try:
-        header = client.recv(8)
-        if len(header) != 8:
-            logging.warning("Incomplete header received")
-            return None, None
-        cam_id, frame_size = struct.unpack('!II', header)
+        header_received = 0
+        while header_received < HEADER.size:
+            n = client.recv_into(header_view[header_received:])
+            if not n:
+                logging.warning("Incomplete header received")
+                return None, None
+            header_received += n
+        cam_id, frame_size = HEADER.unpack_from(header_buf)
         logging.debug(f"Received header: cam_id={cam_id}, frame_size={frame_size}")
 
-        frame_data = b''
+        # Fill the shared receive buffer instead of allocating one per frame
+        if len(frame_buf) < frame_size:
+            frame_buf = bytearray(frame_size)
+        view = memoryview(frame_buf)[:frame_size]
         bytes_received = 0
         while bytes_received < frame_size:
-            chunk = client.recv(min(CONFIG['BUFFER_SIZE'], frame_size - bytes_received))
-            if not chunk:
+            n = client.recv_into(view[bytes_received:], frame_size - bytes_received)
+            if not n:
                 logging.warning("Connection closed during frame receive")
                 return None, None
-            frame_data += chunk
-            bytes_received += len(chunk)
-
-        frame_array = np.frombuffer(frame_data, dtype=np.uint8)
-        frame = cv2.imdecode(frame_array, cv2.IMREAD_COLOR)
-        if frame is None:
-            logging.error(f"Failed to decode frame for cam {cam_id}")
-            return None, None
-        return cam_id, frame
+            bytes_received += n
+        return cam_id, view
     except Exception as e:
         logging.error(f"Error receiving frame: {e}")
         return None, None
 
+def canny_edges(frame):
+    """
+    Returns the Canny edge map of a BGR frame, on the GPU when available.
+    Edges are found at half resolution and scaled back up, and skipped
+    (None) while nobody is watching the edge stream.
+    """
+    if edge_viewers == 0:
+        return None
+    height, width = frame.shape[:2]
+    small = cv2.resize(frame, (width // 2, height // 2), interpolation=cv2.INTER_AREA)
+    if gpu_canny is not None:
+        gpu_frame.upload(small)
+        gray_gpu = cv2.cuda.cvtColor(gpu_frame, cv2.COLOR_BGR2GRAY)
+        edges = gpu_canny.detect(gray_gpu).download()
+    else:
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        edges = cv2.Canny(gray, 100, 200)
+    return cv2.resize(edges, (width, height), interpolation=cv2.INTER_NEAREST)
+
 def apply_edge_detection(frame):
     """Applies Canny edge detection to the frame."""
     if frame is None:
         return None, None
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    edges = cv2.Canny(gray, 100, 200)
+    edges = canny_edges(frame)
     return frame, edges
 
+def drain_to_latest(client, cam_id, payload):
+    """
+    Skips frames already queued on the socket and returns the newest payload.
+    Skipped frames are never decoded, and at most MAX_DRAIN are read so a
+    sender outpacing us can't keep the loop from ever returning.
+    """
+    dropped = 0
+    while dropped < CONFIG['MAX_DRAIN']:
+        readable, _, _ = select.select([client], [], [], 0)
+        if not readable:
+            break
+        # Overwrites the shared buffer, so a failed read loses the previous payload too
+        cam_id, payload = receive_payload(client)
+        if payload is None or cam_id is None:
+            break
+        dropped += 1
+    return cam_id, payload, dropped
+
+def encode_jpeg(image):
+    """Encodes an image to JPEG bytes for the MJPEG stream, on the GPU when available."""
+    if nvjpeg is not None:
+        try:
+            # nvJPEG expects 3-channel input, so expand single-channel edge maps
+            if image.ndim == 2:
+                image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+            return nvjpeg.encode(image, CONFIG['JPEG_QUALITY'])
+        except Exception as e:
+            logging.warning(f"nvJPEG encode failed, using OpenCV: {e}")
+    ret, jpeg = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, CONFIG['JPEG_QUALITY']])
+    return jpeg.tobytes() if ret else None
+
 def generate_mjpeg_stream(data_type):
-    """Generates MJPEG stream for frame or edges."""
-    while True:
+    """Generates MJPEG stream for frame or edges from the cached JPEG bytes."""
+    global edge_viewers
+    is_edges = data_type != 'frame'
+    if is_edges:
         with frame_lock:
-            frame = latest_frame if data_type == 'frame' else latest_edges
-        if frame is not None:
-            ret, jpeg = cv2.imencode('.jpg', frame)
-            if ret:
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + jpeg.tobytes() + b'\r\n')
-        time.sleep(0.1)
-
-@app.route('/')
+            edge_viewers += 1
+    try:
+        last_jpeg = None
+        while True:
+            with frame_ready:
+                # Sleep until main() publishes a frame this client hasn't sent yet
+                while True:
+                    jpeg = latest_edges_jpeg if is_edges else latest_frame_jpeg
+                    if jpeg is not None and jpeg is not last_jpeg:
+                        break
+                    frame_ready.wait()
+            last_jpeg = jpeg
+            yield (b'--frame\r\n'
+                   b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
+    finally:
+        if is_edges:
+            with frame_lock:
+                edge_viewers -= 1
+
 def index():
     """HTML page to display frame and edge map."""
     return '''
@@ -93,22 +192,52 @@ def index():
     </html>
     '''
 
-@app.route('/video_feed/<data_type>')
-def video_feed(data_type):
-    """Serves MJPEG stream for frame or edges."""
-    return Response(generate_mjpeg_stream(data_type),
-                    mimetype='multipart/x-mixed-replace; boundary=frame')
+class StreamHandler(BaseHTTPRequestHandler):
+    """Serves the index page and MJPEG streams straight from the cached JPEG bytes."""
+
+    def do_GET(self):
+        if self.path == '/':
+            body = index().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path.startswith('/video_feed/'):
+            self.video_feed(self.path[len('/video_feed/'):])
+        else:
+            self.send_error(404)
+
+    def video_feed(self, data_type):
+        """Serves MJPEG stream for frame or edges."""
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.send_response(200)
+        self.send_header('Content-Type', 'multipart/x-mixed-replace; boundary=frame')
+        self.end_headers()
+        stream = generate_mjpeg_stream(data_type)
+        try:
+            for chunk in stream:
+                self.wfile.write(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            logging.debug(f"Viewer {self.client_address} disconnected from {data_type} feed")
+        finally:
+            stream.close()
 
-def run_flask():
-    """Runs Flask web server in a separate thread."""
-    app.run(host='0.0.0.0', port=CONFIG['WEB_PORT'], threaded=True)
+    def log_message(self, format, *args):
+        logging.debug(format % args)
+
+def run_web_server():
+    """Runs the MJPEG web server in a separate thread."""
+    server = ThreadingHTTPServer(('0.0.0.0', CONFIG['WEB_PORT']), StreamHandler)
+    server.serve_forever()
 
 def main():
     """Main loop to receive stream, apply edge detection, and update web frames."""
-    flask_thread = Thread(target=run_flask)
-    flask_thread.daemon = True
-    flask_thread.start()
-    logging.info(f"Flask web server started at http://0.0.0.0:{CONFIG['WEB_PORT']}")
+    global latest_frame_jpeg, latest_edges_jpeg
+    web_thread = Thread(target=run_web_server)
+    web_thread.daemon = True
+    web_thread.start()
+    logging.info(f"Web server started at http://0.0.0.0:{CONFIG['WEB_PORT']}")
 
     server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -120,24 +249,55 @@ def main():
     try:
         client, addr = server.accept()
         logging.info(f"Connected to Pi at {addr}")
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Disable Nagle delay
 
         last_frame_time = time.time()
+        last_drop_log = time.time()
+        dropped = 0
         while True:
-            cam_id, frame = receive_frame(client)
-            if frame is None or cam_id is None:
+            cam_id, payload = receive_payload(client)
+            if payload is None or cam_id is None:
+                logging.warning("Skipping invalid frame")
+                continue
+
+            # Catch up to the newest frame so processing never lags capture
+            cam_id, payload, skipped = drain_to_latest(client, cam_id, payload)
+            dropped += skipped
+            if time.time() - last_drop_log > CONFIG['DROP_LOG_INTERVAL']:
+                if dropped:
+                    logging.info(f"Dropped {dropped} stale frames in the last {CONFIG['DROP_LOG_INTERVAL']:.0f}s")
+                dropped = 0
+                last_drop_log = time.time()
+
+            if payload is None or cam_id is None:
                 logging.warning("Skipping invalid frame")
                 continue
             if cam_id != CONFIG['EXPECTED_CAMERA']:
                 logging.warning(f"Unexpected cam_id {cam_id}, expected {CONFIG['EXPECTED_CAMERA']}")
                 continue
 
+            # Only the surviving frame is decoded (decoding copies out of the shared buffer)
+            try:
+                frame = decode_jpeg(payload)
+            except Exception as e:
+                logging.error(f"Error decoding frame: {e}")
+                continue
+            if frame is None:
+                logging.error(f"Failed to decode frame for cam {cam_id}")
+                continue
+
             # Apply edge detection
             output_frame, edges = apply_edge_detection(frame)
 
-            # Update latest frames
-            with frame_lock:
-                latest_frame = output_frame
-                latest_edges = edges
+            # Encode once here so every web client shares the same bytes
+            frame_jpeg = encode_jpeg(output_frame)
+            edges_jpeg = encode_jpeg(edges) if edges is not None else None
+
+            # Update latest frames and wake the MJPEG generators
+            with frame_ready:
+                latest_frame_jpeg = frame_jpeg
+                latest_edges_jpeg = edges_jpeg
+                frame_ready.notify_all()
             logging.debug(f"Updated frame for cam {cam_id}")
 
             if time.time() - last_frame_time > CONFIG['FRAME_TIMEOUT']:
@@ -0,0 +1,78 @@
+import os
+import socket
+import struct
+import logging
+
+# Frame header sent by the Pi before each JPEG (cam_id, frame_size)
+HEADER = struct.Struct('!II')
+
+# MSG_WAITALL makes the kernel fill a whole request; Windows semantics differ, so loop there
+USE_WAITALL = os.name != 'nt' and hasattr(socket, 'MSG_WAITALL')
+
+class FrameRing:
+    """
+    Receive ring buffer for the Pi's (header, JPEG) stream. Each recv pulls in
+    as much as is available, and every complete frame already buffered is
+    parsed without another syscall.
+    """
+
+    def __init__(self, size):
+        self.buf = bytearray(size)
+        self.view = memoryview(self.buf)
+        self.start = 0  # First unparsed byte
+        self.end = 0  # End of received data
+
+    def fill(self, client, needed):
+        """
+        Receives until at least `needed` unparsed bytes are buffered.
+        Returns False if the connection closed first.
+        """
+        pending = self.end - self.start
+        if self.start + needed > len(self.buf):
+            # Not enough room after the unparsed bytes: move them to the front,
+            # growing the ring if a single frame is larger than it
+            if needed > len(self.buf):
+                new_buf = bytearray(max(needed, 2 * len(self.buf)))
+                new_buf[:pending] = self.view[self.start:self.end]
+                self.buf, self.view = new_buf, memoryview(new_buf)
+            else:
+                self.buf[:pending] = self.buf[self.start:self.end]
+            self.start, self.end = 0, pending
+        if self.end - self.start < needed:
+            # Take whatever has already arrived, possibly several frames' worth
+            n = client.recv_into(self.view[self.end:], len(self.buf) - self.end)
+            if not n:
+                return False
+            self.end += n
+        missing = needed - (self.end - self.start)
+        if missing > 0 and USE_WAITALL:
+            # Rest of a large frame: one call instead of a Python loop over partial reads
+            n = client.recv_into(self.view[self.end:], missing, socket.MSG_WAITALL)
+            if not n:
+                return False
+            self.end += n
+        # Windows fallback (also finishes a MSG_WAITALL read cut short by a signal)
+        while self.end - self.start < needed:
+            n = client.recv_into(self.view[self.end:], len(self.buf) - self.end)
+            if not n:
+                return False
+            self.end += n
+        return True
+
+    def next_payload(self, client):
+        """
+        Parses the next (cam_id, frame_size) header and payload.
+        Returns (cam_id, payload) where payload is a memoryview into the ring that
+        is only valid until the next call, or (None, None) if the connection closed.
+        """
+        if self.start == self.end:
+            self.start = self.end = 0  # Everything parsed; restart at the front for free
+        if not self.fill(client, HEADER.size):
+            return None, None
+        cam_id, frame_size = HEADER.unpack_from(self.buf, self.start)
+        logging.debug(f"Received header: cam_id={cam_id}, frame_size={frame_size}")
+        if not self.fill(client, HEADER.size + frame_size):
+            return None, None
+        payload_start = self.start + HEADER.size
+        self.start = payload_start + frame_size
+        return cam_id, self.view[payload_start:self.start]
@@ -0,0 +1,55 @@
+import os
+import sys
+import socket
+import logging
+
+IS_LINUX = sys.platform.startswith('linux')
+SO_RCVBUFFORCE = 33  # Linux value; not exposed by the socket module
+SO_BUSY_POLL = 46  # Linux value; not exposed by the socket module
+
+def set_receive_buffer(sock, size):
+    """
+    Sets the kernel receive buffer of sock to size bytes. Call on the listening
+    socket before listen() so accepted connections inherit it and the TCP
+    window scale is negotiated for it. On Linux, SO_RCVBUFFORCE (needs
+    CAP_NET_ADMIN) bypasses net.core.rmem_max; otherwise the kernel clamps.
+    """
+    forced = False
+    if IS_LINUX:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, SO_RCVBUFFORCE, size)
+            forced = True
+        except OSError:
+            pass
+    if not forced:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+    # Linux reports double the usable size (bookkeeping overhead), so less than requested means clamped
+    actual = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+    if actual < size:
+        logging.warning(f"Receive buffer clamped to {actual} bytes (asked for {size}); "
+                        f"raise net.core.rmem_max or run with CAP_NET_ADMIN")
+
+def enable_busy_poll(sock, usec):
+    """
+    Makes blocking receives on sock spin on the NIC queue for up to usec
+    microseconds instead of sleeping until the next interrupt. Linux only;
+    a no-op elsewhere or when usec is 0.
+    """
+    if not usec or not IS_LINUX:
+        return
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, usec)
+    except OSError as e:
+        logging.warning(f"Busy polling unavailable (needs CAP_NET_ADMIN): {e}")
+
+def pin_thread(env_var):
+    """Pins the calling thread to the CPU list in env_var (e.g. "2" or "4-7,12"), if set."""
+    cpu_list = os.environ.get(env_var)
+    if not cpu_list or not hasattr(os, 'sched_setaffinity'):
+        return
+    cpus = set()
+    for part in cpu_list.split(','):
+        start, _, end = part.partition('-')
+        cpus.update(range(int(start), int(end or start) + 1))
+    os.sched_setaffinity(0, cpus)  # 0 = calling thread on Linux
+    logging.info(f"Pinned {env_var} thread to CPUs {cpu_list}")
@@ -1,5 +1,6 @@
 import requests
 import json
+from requests.adapters import HTTPAdapter
 
 # --- Configuration ---
 # The URL for your local Ollama API endpoint.
@@ -12,6 +13,10 @@ MODEL_NAME = "phi3:mini"
 # The simple question we will ask the AI.
 TEST_PROMPT = "In one short sentence, why is the sky blue?"
 
+# A keep-alive session, the same way server.py talks to Ollama.
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+
 def test_ai_connection():
     """
     Sends a simple text prompt to the Ollama AI and prints the response.
@@ -28,7 +33,7 @@ def test_ai_connection():
     try:
         print("Sending prompt to the AI...")
         # We'll set a reasonable timeout, e.g., 30 seconds.
-        response = requests.post(OLLAMA_API_URL, json=payload, timeout=300)
+        response = SESSION.post(OLLAMA_API_URL, json=payload, timeout=300)
         
         # Check if the request was successful (HTTP status code 200)
         response.raise_for_status()
@@ -1,5 +1,5 @@
 import socket
-import json
+import orjson
 import logging
 
 # Configure logging for debugging
@@ -10,20 +10,24 @@ CONFIG = {
     'HOST': '',               # Empty string binds to all interfaces
     'PORT_HANDSHAKE': 5000,   # Port to listen for handshake
     'BUFFER_SIZE': 4096,      # Socket buffer size in bytes
-    'EXPECTED_CAMERAS': [0, 1] # Expected camera indices from Pi
+    'EXPECTED_CAMERAS': (0, 1) # Expected camera indices from Pi
 }
 
+# Keys every handshake payload must carry
+REQUIRED_KEYS = frozenset(('resolution', 'fps', 'cameras', 'timestamp'))
+
 def validate_payload(payload):
     """
     Validates the received config payload.
     Returns True if valid, False otherwise.
     """
-    required_keys = {'resolution', 'fps', 'cameras', 'timestamp'}
-    if not all(key in payload for key in required_keys):
+    if not REQUIRED_KEYS.issubset(payload):
         logging.error("Payload missing required keys")
         return False
-    if payload['cameras'] != CONFIG['EXPECTED_CAMERAS']:
-        logging.error(f"Expected cameras {CONFIG['EXPECTED_CAMERAS']}, got {payload['cameras']}")
+    cameras = payload['cameras']
+    # JSON arrays decode to lists, so compare as a tuple
+    if not isinstance(cameras, list) or tuple(cameras) != CONFIG['EXPECTED_CAMERAS']:
+        logging.error(f"Expected cameras {CONFIG['EXPECTED_CAMERAS']}, got {cameras}")
         return False
     if not isinstance(payload['resolution'], (list, tuple)) or len(payload['resolution']) != 2:
         logging.error("Invalid resolution format")
@@ -44,24 +48,28 @@ def handle_handshake():
         # Accept connection from Pi
         client, addr = server.accept()
         logging.info(f"Connected to Pi at {addr}")
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Send ACK without Nagle delay
 
-        # Receive payload length (4 bytes)
-        length_bytes = client.recv(4)
-        if not length_bytes:
+        # Receive payload length (4 bytes); MSG_WAITALL blocks until all of it arrives
+        length_bytes = bytearray(4)
+        if client.recv_into(length_bytes, 4, socket.MSG_WAITALL) != 4:
             logging.error("No data received")
             return
         length = int.from_bytes(length_bytes, byteorder='big')
 
-        # Receive JSON payload
-        payload_bytes = client.recv(length)
-        payload = json.loads(payload_bytes.decode('utf-8'))
+        # Receive JSON payload, which may span several TCP segments
+        payload_bytes = bytearray(length)
+        if client.recv_into(payload_bytes, length, socket.MSG_WAITALL) != length:
+            logging.error("Connection closed before full payload received")
+            return
+        payload = orjson.loads(payload_bytes)
         logging.info(f"Received payload: {payload}")
 
         # Validate payload
         if validate_payload(payload):
             # Send ACK with current timestamp
             ack = {'status': 'ACK', 'timestamp': payload['timestamp']}
-            client.sendall(json.dumps(ack).encode('utf-8'))
+            client.sendall(orjson.dumps(ack))
             logging.info("Sent ACK to Pi")
         else:
             logging.error("Payload validation failed, no ACK sent")
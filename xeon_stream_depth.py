@@ -1,12 +1,16 @@
+import inspect
+import shutil
 import socket
 import cv2
 import numpy as np
 import logging
-import struct
 import time
+import queue
 from flask import Flask, Response
-from threading import Thread, Lock
+from threading import Thread, Lock, Condition
 import io
+from stream_ring import FrameRing
+from stream_tuning import set_receive_buffer, enable_busy_poll, pin_thread
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -15,113 +19,327 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 CONFIG = {
     'HOST': '',               # Bind to all interfaces for TCP
     'PORT_STREAM': 5001,      # Port for video stream
-    'BUFFER_SIZE': 4096,      # Socket buffer size
+    'RING_SIZE': 4 * 1024 * 1024,  # Receive ring buffer; grows if a frame is larger
+    'RCVBUF_SIZE': 4 * 1024 * 1024,  # Kernel receive buffer for the stream socket
+    'BUSY_POLL_USEC': 50,     # NAPI busy-poll time for blocking recvs (0 disables)
     'FRAME_TIMEOUT': 1.0,     # Seconds before dropping frame
     'WEB_PORT': 8080,         # Port for Flask web server
     'BASELINE': 0.1,          # Distance between cameras in meters (adjust to your setup)
-    'FOCAL_LENGTH': 500.0     # Focal length in pixels (rough estimate for 320x240)
+    'FOCAL_LENGTH': 500.0,    # Focal length in pixels (rough estimate for 320x240)
+    'JPEG_QUALITY': 80,       # JPEG quality for the MJPEG web stream
+    'QUEUE_SIZE': 2,          # Max items waiting between pipeline stages (oldest dropped)
+    'FRAME_POOL_SIZE': 6      # Decoded image buffers kept for reuse, per image shape
 }
 
 # Initialize Flask app
 app = Flask(__name__)
 
-# Store latest frames and depth map in memory with thread-safe lock
-latest_frames = {0: None, 1: None}  # cam_id: original frame
-latest_depth = None  # Depth map
+# Latest JPEG bytes served to web clients, swapped in whole by the stereo thread
+frame_viewers = 0  # Open camera feed streams; color decode is skipped while zero
+latest_jpeg = {0: None, 1: None, 'depth': None}
 frame_lock = Lock()
+frame_ready = Condition(frame_lock)  # Notified whenever new JPEGs are cached
 
-def receive_frame(client):
-    """Receives a frame with header (cam_id, frame_size) and decodes it."""
+# Pipeline stages: receive -> io_q -> decode -> dec_q -> stereo/detect
+io_q = queue.Queue(maxsize=CONFIG['QUEUE_SIZE'])   # (cam_id, seq, JPEG bytes)
+dec_q = queue.Queue(maxsize=CONFIG['QUEUE_SIZE'])  # (cam_id, seq, gray, frame)
+
+# Decoded image buffers handed back by the stereo thread once it is done with them
+frame_pools = {}  # shape: queue.Queue of free uint8 arrays
+
+# Decode with libjpeg-turbo (PyTurboJPEG) when installed, else fall back to OpenCV
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJPF_GRAY
+    tj = TurboJPEG()
+except Exception as e:
+    tj = None
+    logging.warning(f"TurboJPEG unavailable, using OpenCV to decode: {e}")
+# Decoding into a preallocated array (dst) needs PyTurboJPEG 2.0+
+tj_dst = tj is not None and 'dst' in inspect.signature(tj.decode).parameters
+
+# Decode color on the GPU with nvJPEG when an NVIDIA GPU is present (luma-only decodes stay on TurboJPEG)
+nvjpeg = None
+if shutil.which('nvidia-smi'):
     try:
-        header = client.recv(8)
-        if len(header) != 8:
-            logging.warning("Incomplete header received")
-            return None, None
-        cam_id, frame_size = struct.unpack('!II', header)
-        logging.debug(f"Received header: cam_id={cam_id}, frame_size={frame_size}")
-
-        frame_data = b''
-        bytes_received = 0
-        while bytes_received < frame_size:
-            chunk = client.recv(min(CONFIG['BUFFER_SIZE'], frame_size - bytes_received))
-            if not chunk:
-                logging.warning("Connection closed during frame receive")
-                return None, None
-            frame_data += chunk
-            bytes_received += len(chunk)
-
-        frame_array = np.frombuffer(frame_data, dtype=np.uint8)
-        frame = cv2.imdecode(frame_array, cv2.IMREAD_COLOR)
-        if frame is None:
-            logging.error(f"Failed to decode frame for cam {cam_id}")
+        from nvjpeg import NvJpeg  # pip install pynvjpeg
+        nvjpeg = NvJpeg()
+        logging.info("NVIDIA GPU found, using nvJPEG for color JPEG decode")
+    except Exception as e:
+        logging.warning(f"nvJPEG unavailable, decoding on the CPU: {e}")
+
+# Run StereoBM and Canny on the GPU when OpenCV is built with CUDA
+use_cuda = cv2.cuda.getCudaEnabledDeviceCount() > 0
+if use_cuda:
+    gpu_stereo = cv2.cuda.createStereoBM(numDisparities=16, blockSize=15)
+    gpu_canny = cv2.cuda.createCannyEdgeDetector(100, 200)
+    # Per-camera device buffers and streams, reused across frames
+    gpu_frames = {0: cv2.cuda_GpuMat(), 1: cv2.cuda_GpuMat()}
+    gpu_streams = {0: cv2.cuda_Stream(), 1: cv2.cuda_Stream()}
+    gpu_edge_input = cv2.cuda_GpuMat()
+    logging.info("CUDA device found, running StereoBM and Canny on the GPU")
+else:
+    cpu_stereo = cv2.StereoBM_create(numDisparities=16, blockSize=15)
+
+# Disparity output buffers, reused across frames (reallocated if the frame size changes)
+disparity_buf = None  # int16 StereoBM output at half resolution
+depth_small_buf = None  # uint8 normalized depth map at half resolution
+depth_buf = None  # uint8 depth map scaled back to full resolution
+
+def take_buffer(shape):
+    """Returns a free uint8 array of the given shape from the pool, or a new one if none is free."""
+    pool = frame_pools.get(shape)
+    if pool is not None:
+        try:
+            return pool.get_nowait()
+        except queue.Empty:
+            pass
+    return np.empty(shape, np.uint8)
+
+def release_buffer(image):
+    """Returns a decoded image to the pool; only call once nothing else reads it."""
+    if image is None or not tj_dst:
+        return  # Only the TurboJPEG dst path decodes into pooled buffers
+    if image.shape not in frame_pools:
+        frame_pools[image.shape] = queue.Queue(maxsize=CONFIG['FRAME_POOL_SIZE'])
+    try:
+        frame_pools[image.shape].put_nowait(image)
+    except queue.Full:
+        pass
+
+def decode_jpeg(frame_data, gray=False):
+    """
+    Decodes JPEG bytes straight to a BGR image, or to a single-channel
+    grayscale image when gray=True (skips chroma decoding entirely).
+    With PyTurboJPEG 2.0+ the image is written into a pooled buffer; pass
+    it to release_buffer() when done.
+    """
+    if gray and tj is not None:
+        # TurboJPEG's luma-only decode beats a full-color GPU decode plus download
+        if tj_dst:
+            # Decode into a recycled array; decode() returns a new one if dst doesn't fit
+            width, height, _, _ = tj.decode_header(frame_data)
+            dst = take_buffer((height, width)).reshape(height, width, 1)
+            return tj.decode(frame_data, pixel_format=TJPF_GRAY, dst=dst)[:, :, 0]
+        return tj.decode(frame_data, pixel_format=TJPF_GRAY)[:, :, 0]
+    if nvjpeg is not None:
+        # nvJPEG decodes all planes on the GPU, so luma is taken from its BGR output
+        frame = nvjpeg.decode(bytes(frame_data))
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if gray else frame
+    if tj is not None:
+        if tj_dst:
+            width, height, _, _ = tj.decode_header(frame_data)
+            return tj.decode(frame_data, pixel_format=TJPF_BGR, dst=take_buffer((height, width, 3)))
+        return tj.decode(frame_data, pixel_format=TJPF_BGR)
+    frame_array = np.frombuffer(frame_data, dtype=np.uint8)
+    return cv2.imdecode(frame_array, cv2.IMREAD_GRAYSCALE if gray else cv2.IMREAD_COLOR)
+
+# Receive ring shared by every frame on the stream socket (see stream_ring.py)
+ring = FrameRing(CONFIG['RING_SIZE'])
+
+def receive_jpeg(client):
+    """
+    Receives a frame with header (cam_id, frame_size).
+    Returns (cam_id, frame_data) with the still-compressed JPEG bytes.
+    """
+    try:
+        cam_id, frame_data = ring.next_payload(client)
+        if frame_data is None:
+            logging.warning("Connection closed during frame receive")
             return None, None
-        return cam_id, frame
+        # Copy out of the ring, since the decode thread reads it after the ring moves on
+        return cam_id, bytes(frame_data)
     except Exception as e:
         logging.error(f"Error receiving frame: {e}")
         return None, None
 
-def compute_depth_map(left_frame, right_frame):
-    """Computes depth map from stereo pair using StereoBM."""
-    if left_frame is None or right_frame is None:
+def put_latest(q, item):
+    """Puts item on a bounded queue, dropping the oldest entry instead of blocking when full."""
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+                logging.debug("Pipeline stage behind, dropped oldest item")
+            except queue.Empty:
+                pass
+
+def decode_loop():
+    """Decode stage: turns JPEG bytes from io_q into images on dec_q."""
+    while True:
+        cam_id, seq, frame_data = io_q.get()
+        try:
+            # Depth and detection only need luma; color is just for the web view
+            if frame_viewers > 0:
+                # Decode once to BGR and take luma from it rather than decoding twice
+                frame = decode_jpeg(frame_data)
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame is not None else None
+            else:
+                frame = None
+                gray = decode_jpeg(frame_data, gray=True)
+        except Exception as e:
+            logging.error(f"Error decoding frame for cam {cam_id}: {e}")
+            continue
+        if gray is None:
+            logging.error(f"Failed to decode frame for cam {cam_id}")
+            continue
+        put_latest(dec_q, (cam_id, seq, gray, frame))
+
+def stereo_loop():
+    """Stereo stage: pairs the newest left/right frames, computes depth and detections, publishes JPEGs."""
+    global latest_jpeg
+    raw_frames = {0: None, 1: None}  # cam_id: (gray, frame) as decoded; never drawn on
+    display_frames = {0: None, 1: None, 'depth': None}  # Annotated images for the MJPEG feeds
+    latest_seq = {0: -1, 1: -1}  # cam_id: frame index of the stored frame
+    while True:
+        cam_id, seq, gray, frame = dec_q.get()
+        if seq <= latest_seq[cam_id]:
+            # Older than what we already have for this camera
+            release_buffer(gray)
+            release_buffer(frame)
+            continue
+        latest_seq[cam_id] = seq
+        if raw_frames[cam_id] is not None:
+            # Superseded frames are no longer referenced (display frames are copies or replaced below)
+            for image in raw_frames[cam_id]:
+                release_buffer(image)
+        raw_frames[cam_id] = (gray, frame)
+        display_frames[cam_id] = frame
+        try:
+            # Compute depth map if both frames available; only ever reads the raw frames
+            if raw_frames[0] is not None and raw_frames[1] is not None:
+                (left_gray, left_frame), (right_gray, right_frame) = raw_frames[0], raw_frames[1]
+                depth_map = compute_depth_map(left_gray, right_gray)
+                # Draw bounding boxes and depth onto copies for display
+                display_frames[0] = detect_objects_and_depth(left_frame, left_gray, depth_map)
+                display_frames[1] = detect_objects_and_depth(right_frame, right_gray, depth_map)
+                display_frames['depth'] = depth_map
+            # Encode outside the lock; web clients only ever see a complete set
+            jpegs = {key: encode_jpeg(image) if image is not None else None
+                     for key, image in display_frames.items()}
+        except Exception as e:
+            logging.error(f"Error processing frame for cam {cam_id}: {e}")
+            continue
+        with frame_ready:
+            latest_jpeg = jpegs
+            frame_ready.notify_all()
+        logging.debug(f"Updated frame for cam {cam_id}")
+
+def compute_depth_map(left_gray, right_gray):
+    """
+    Computes depth map from a grayscale stereo pair using StereoBM.
+    Matching runs on a 2x downsampled pair (about 4x less work) and the
+    result is upscaled; it lives in a reused buffer overwritten by the next call.
+    """
+    global disparity_buf, depth_small_buf, depth_buf
+    if left_gray is None or right_gray is None:
         return None
-    # Convert to grayscale
-    left_gray = cv2.cvtColor(left_frame, cv2.COLOR_BGR2GRAY)
-    right_gray = cv2.cvtColor(right_frame, cv2.COLOR_BGR2GRAY)
-    
-    # Create StereoBM object
-    stereo = cv2.StereoBM_create(numDisparities=16, blockSize=15)
-    # Compute disparity
-    disparity = stereo.compute(left_gray, right_gray)
-    # Normalize for visualization
-    disparity = cv2.normalize(disparity, None, alpha=0, beta=255, norm_type=cv2.NORM_MINMAX, dtype=cv2.CV_8U)
-    return disparity
-
-def detect_objects_and_depth(frame, depth_map):
-    """Detects large objects, draws bounding boxes, and estimates depth."""
+    height, width = left_gray.shape[:2]
+    left_small = cv2.pyrDown(left_gray)
+    right_small = cv2.pyrDown(right_gray)
+
+    if use_cuda:
+        # Upload both views on their own streams so the copies overlap
+        gpu_frames[0].upload(left_small, gpu_streams[0])
+        gpu_frames[1].upload(right_small, gpu_streams[1])
+        gpu_streams[1].waitForCompletion()
+        disparity_gpu = gpu_stereo.compute(gpu_frames[0], gpu_frames[1], gpu_streams[0])
+        disparity = disparity_gpu.download(gpu_streams[0])
+        gpu_streams[0].waitForCompletion()
+    else:
+        if disparity_buf is None or disparity_buf.shape != left_small.shape:
+            disparity_buf = np.empty(left_small.shape, np.int16)
+        disparity = cpu_stereo.compute(left_small, right_small, disparity_buf)
+    # Normalize for visualization (min-max scaling also cancels the half-resolution disparity scale)
+    if depth_small_buf is None or depth_small_buf.shape != disparity.shape:
+        depth_small_buf = np.empty(disparity.shape, np.uint8)
+    cv2.normalize(disparity, depth_small_buf, alpha=0, beta=255, norm_type=cv2.NORM_MINMAX, dtype=cv2.CV_8U)
+    # Nearest-neighbour upscale so disparity edges aren't blended into false depths
+    if depth_buf is None or depth_buf.shape != (height, width):
+        depth_buf = np.empty((height, width), np.uint8)
+    return cv2.resize(depth_small_buf, (width, height), depth_buf, interpolation=cv2.INTER_NEAREST)
+
+def canny_edges(gray):
+    """Returns the Canny edge map of a grayscale frame, on the GPU when available."""
+    if use_cuda:
+        gpu_edge_input.upload(gray)
+        return gpu_canny.detect(gpu_edge_input).download()
+    return cv2.Canny(gray, 100, 200)
+
+def detect_objects_and_depth(frame, gray, depth_map):
+    """Detects large objects in gray, draws bounding boxes on frame, and estimates depth."""
     if frame is None or depth_map is None:
         return frame
     # Apply Canny edge detection
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    edges = cv2.Canny(gray, 100, 200)
+    edges = canny_edges(gray)
     
-    # Find contours
-    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    # Label the regions enclosed by edges; 4-connectivity so regions can't leak
+    # diagonally through 8-connected Canny lines (label 0 is the edge pixels)
+    n, labels, stats, _ = cv2.connectedComponentsWithStats((edges == 0).view(np.uint8), connectivity=4)
     output_frame = frame.copy()
-    
-    # Filter large contours (area > 10% of frame)
-    min_area = 0.1 * frame.shape[0] * frame.shape[1]
-    for contour in contours:
-        if cv2.contourArea(contour) > min_area:
-            # Get bounding box
-            x, y, w, h = cv2.boundingRect(contour)
-            # Estimate average depth in the bounding box
-            depth_roi = depth_map[y:y+h, x:x+w]
-            valid_depth = depth_roi[depth_roi > 0]  # Ignore zero disparity
-            if len(valid_depth) > 0:
-                avg_disparity = np.mean(valid_depth)
-                if avg_disparity > 0:  # Avoid division by zero
-                    depth_meters = (CONFIG['FOCAL_LENGTH'] * CONFIG['BASELINE']) / avg_disparity
-                    # Draw bounding box and depth label
-                    cv2.rectangle(output_frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
-                    cv2.putText(output_frame, f"{depth_meters:.2f}m", (x, y-10),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+
+    # Keep large enclosed regions (area > 10% of frame); anything touching the border isn't enclosed
+    height, width = edges.shape
+    min_area = 0.1 * height * width
+    left, top = stats[:, cv2.CC_STAT_LEFT], stats[:, cv2.CC_STAT_TOP]
+    right, bottom = left + stats[:, cv2.CC_STAT_WIDTH], top + stats[:, cv2.CC_STAT_HEIGHT]
+    enclosed = (left > 0) & (top > 0) & (right < width) & (bottom < height)
+    keep = np.flatnonzero(enclosed & (stats[:, cv2.CC_STAT_AREA] > min_area))
+    keep = keep[keep > 0]
+    if len(keep) == 0:
+        return output_frame
+
+    # Average each region's nonzero disparity for all regions at once
+    valid = depth_map > 0  # Ignore zero disparity
+    sums = np.bincount(labels[valid], weights=depth_map[valid], minlength=n)[keep]
+    counts = np.bincount(labels[valid], minlength=n)[keep]
+    avg_disparity = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+    depths = np.divide(CONFIG['FOCAL_LENGTH'] * CONFIG['BASELINE'], avg_disparity,
+                       out=np.zeros_like(avg_disparity), where=avg_disparity > 0)
+    boxes = stats[keep]
+
+    # Draw bounding box and depth label for objects with a usable disparity
+    for box, depth_meters in zip(boxes, depths):
+        if depth_meters > 0:
+            x, y, w, h = (int(v) for v in box[:4])
+            cv2.rectangle(output_frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
+            cv2.putText(output_frame, f"{depth_meters:.2f}m", (x, y-10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
     return output_frame
 
+def encode_jpeg(image):
+    """Encodes an image to JPEG bytes for the MJPEG stream."""
+    if tj is not None and image.ndim == 3:
+        return tj.encode(image, quality=CONFIG['JPEG_QUALITY'], pixel_format=TJPF_BGR)
+    ret, jpeg = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, CONFIG['JPEG_QUALITY']])
+    return jpeg.tobytes() if ret else None
+
 def generate_mjpeg_stream(data_type):
-    """Generates MJPEG stream for original frame (cam0/1) or depth map."""
-    while True:
+    """Generates MJPEG stream for original frame (cam0/1) or depth map from the cached JPEG bytes."""
+    global frame_viewers
+    is_camera = data_type != 'depth'
+    if is_camera:
         with frame_lock:
-            if data_type == 'depth':
-                frame = latest_depth
-            else:
-                cam_id = int(data_type)
-                frame = latest_frames.get(cam_id)
-        if frame is not None:
-            ret, jpeg = cv2.imencode('.jpg', frame)
-            if ret:
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + jpeg.tobytes() + b'\r\n')
-        time.sleep(0.1)  # Limit refresh rate
+            frame_viewers += 1
+    try:
+        key = 'depth' if data_type == 'depth' else int(data_type)
+        last_jpeg = None
+        while True:
+            with frame_ready:
+                # Sleep until a frame this client hasn't sent yet is published
+                while True:
+                    jpeg = latest_jpeg.get(key)
+                    if jpeg is not None and jpeg is not last_jpeg:
+                        break
+                    frame_ready.wait()
+            last_jpeg = jpeg
+            yield (b'--frame\r\n'
+                   b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
+    finally:
+        if is_camera:
+            with frame_lock:
+                frame_viewers -= 1
 
 @app.route('/')
 def index():
@@ -148,10 +366,11 @@ def video_feed(data_type):
 
 def run_flask():
     """Runs Flask web server in a separate thread."""
+    pin_thread('WEB_CPUS')  # Keep web serving off the receive core
     app.run(host='0.0.0.0', port=CONFIG['WEB_PORT'], threaded=True)
 
 def main():
-    """Main loop to receive stereo stream, compute depth, and update web frames."""
+    """Main loop to receive the stereo stream and feed the decode/stereo pipeline."""
     flask_thread = Thread(target=run_flask)
     flask_thread.daemon = True
     flask_thread.start()
@@ -159,6 +378,9 @@ def main():
 
     server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, 'SO_REUSEPORT'):
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)  # Allow extra receiver processes later
+    set_receive_buffer(server, CONFIG['RCVBUF_SIZE'])  # Before listen() so accepted sockets inherit it
     server.bind((CONFIG['HOST'], CONFIG['PORT_STREAM']))
     server.listen(1)
     server.settimeout(10.0)
@@ -167,24 +389,27 @@ def main():
     try:
         client, addr = server.accept()
         logging.info(f"Connected to Pi at {addr}")
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Disable Nagle delay
+        if hasattr(socket, 'TCP_QUICKACK'):  # Linux only; ACK immediately instead of delaying
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        enable_busy_poll(client, CONFIG['BUSY_POLL_USEC'])  # Spin on the NIC queue instead of sleeping
+
+        # Start the worker stages before pinning so they aren't confined to the receive core
+        for stage in (decode_loop, stereo_loop):
+            Thread(target=stage, daemon=True).start()
+
+        # Run the receive loop on its own core, next to the NIC (see run_xeon_stream.sh)
+        pin_thread('STREAM_CPUS')
 
         last_frame_time = time.time()
+        seq = {0: 0, 1: 0}  # Per-camera frame index, so stale frames can be told apart downstream
         while True:
-            cam_id, frame = receive_frame(client)
-            if frame is None or cam_id is None:
+            cam_id, frame_data = receive_jpeg(client)
+            if frame_data is None or cam_id not in seq:
                 logging.warning("Skipping invalid frame")
                 continue
-
-            # Update latest frame
-            with frame_lock:
-                latest_frames[cam_id] = frame
-                # Compute depth map if both frames available
-                if latest_frames[0] is not None and latest_frames[1] is not None:
-                    latest_depth = compute_depth_map(latest_frames[0], latest_frames[1])
-                    # Update frames with bounding boxes and depth
-                    latest_frames[0] = detect_objects_and_depth(latest_frames[0], latest_depth)
-                    latest_frames[1] = detect_objects_and_depth(latest_frames[1], latest_depth)
-                logging.debug(f"Updated frame for cam {cam_id}")
+            seq[cam_id] += 1
+            put_latest(io_q, (cam_id, seq[cam_id], frame_data))
 
             if time.time() - last_frame_time > CONFIG['FRAME_TIMEOUT']:
                 logging.warning("Frame timeout, possible lag")
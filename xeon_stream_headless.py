@@ -2,11 +2,12 @@ import socket
 import cv2
 import numpy as np
 import logging
-import struct
 import time
 from flask import Flask, Response
-from threading import Thread, Lock
+from threading import Thread, Lock, Condition
 import io
+from stream_ring import FrameRing
+from stream_tuning import set_receive_buffer, enable_busy_poll, pin_thread
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -15,44 +16,55 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 CONFIG = {
     'HOST': '',               # Bind to all interfaces for TCP
     'PORT_STREAM': 5001,      # Port for video stream
-    'BUFFER_SIZE': 4096,      # Socket buffer size
+    'RING_SIZE': 4 * 1024 * 1024,  # Receive ring buffer; grows if a frame is larger
+    'RCVBUF_SIZE': 4 * 1024 * 1024,  # Kernel receive buffer for the stream socket
+    'BUSY_POLL_USEC': 50,     # NAPI busy-poll time for blocking recvs (0 disables)
     'FRAME_TIMEOUT': 1.0,     # Seconds before dropping frame
-    'WEB_PORT': 8080          # Port for Flask web server
+    'WEB_PORT': 8080,         # Port for Flask web server
+    'JPEG_QUALITY': 80        # JPEG quality for the MJPEG web stream
 }
 
 # Initialize Flask app
 app = Flask(__name__)
 
-# Store latest edge-detected frames in memory with thread-safe lock
-latest_frames = {0: None, 1: None}  # cam_id: edge-detected frame
+# Store latest JPEG-encoded edge maps in memory with thread-safe lock
+latest_jpeg = {0: None, 1: None}  # cam_id: JPEG-encoded edge-detected frame
 frame_lock = Lock()
+frame_ready = Condition(frame_lock)  # Notified whenever a new JPEG is cached
+
+# Decode with libjpeg-turbo (PyTurboJPEG) when installed, else fall back to OpenCV
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJPF_GRAY
+    tj = TurboJPEG()
+except Exception as e:
+    tj = None
+    logging.warning(f"TurboJPEG unavailable, using OpenCV to decode: {e}")
+
+def decode_jpeg(frame_data, gray=False):
+    """
+    Decodes JPEG bytes straight to a BGR image, or to a single-channel
+    grayscale image when gray=True (skips chroma decoding entirely).
+    """
+    if tj is not None:
+        if gray:
+            return tj.decode(frame_data, pixel_format=TJPF_GRAY)[:, :, 0]
+        return tj.decode(frame_data, pixel_format=TJPF_BGR)
+    frame_array = np.frombuffer(frame_data, dtype=np.uint8)
+    return cv2.imdecode(frame_array, cv2.IMREAD_GRAYSCALE if gray else cv2.IMREAD_COLOR)
+
+# Receive ring shared by every frame on the stream socket (see stream_ring.py)
+ring = FrameRing(CONFIG['RING_SIZE'])
 
 def receive_frame(client):
-    """Receives a frame with header (cam_id, frame_size) and decodes it."""
+    """Receives a frame with header (cam_id, frame_size) and decodes it to grayscale."""
     try:
-        # Receive header (8 bytes: 4 for cam_id, 4 for frame_size)
-        header = client.recv(8)
-        if len(header) != 8:
-            logging.warning("Incomplete header received")
+        cam_id, frame_data = ring.next_payload(client)
+        if frame_data is None:
+            logging.warning("Connection closed during frame receive")
             return None, None
 
-        cam_id, frame_size = struct.unpack('!II', header)
-        logging.debug(f"Received header: cam_id={cam_id}, frame_size={frame_size}")
-
-        # Receive frame data
-        frame_data = b''
-        bytes_received = 0
-        while bytes_received < frame_size:
-            chunk = client.recv(min(CONFIG['BUFFER_SIZE'], frame_size - bytes_received))
-            if not chunk:
-                logging.warning("Connection closed during frame receive")
-                return None, None
-            frame_data += chunk
-            bytes_received += len(chunk)
-
-        # Decode JPEG to OpenCV image
-        frame_array = np.frombuffer(frame_data, dtype=np.uint8)
-        frame = cv2.imdecode(frame_array, cv2.IMREAD_COLOR)
+        # Decode JPEG to a grayscale image; only luma is needed for edge detection
+        frame = decode_jpeg(frame_data, gray=True)
         if frame is None:
             logging.error(f"Failed to decode frame for cam {cam_id}")
             return None, None
@@ -63,24 +75,32 @@ def receive_frame(client):
         logging.error(f"Error receiving frame: {e}")
         return None, None
 
-def apply_edge_detection(frame):
-    """Applies Canny edge detection to the frame."""
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+def apply_edge_detection(gray):
+    """Applies Canny edge detection to a grayscale frame."""
     edges = cv2.Canny(gray, 100, 200)  # Thresholds for edge detection
     return edges
 
+def encode_jpeg(image):
+    """Encodes an image to JPEG bytes for the MJPEG stream."""
+    if tj is not None and image.ndim == 3:
+        return tj.encode(image, quality=CONFIG['JPEG_QUALITY'], pixel_format=TJPF_BGR)
+    ret, jpeg = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, CONFIG['JPEG_QUALITY']])
+    return jpeg.tobytes() if ret else None
+
 def generate_mjpeg_stream(cam_id):
-    """Generates MJPEG stream for a specific camera."""
+    """Generates MJPEG stream for a specific camera from the cached JPEG bytes."""
+    last_jpeg = None
     while True:
-        with frame_lock:
-            frame = latest_frames.get(cam_id)
-        if frame is not None:
-            # Encode frame as JPEG
-            ret, jpeg = cv2.imencode('.jpg', frame)
-            if ret:
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + jpeg.tobytes() + b'\r\n')
-        time.sleep(0.1)  # Limit refresh rate to reduce CPU load
+        with frame_ready:
+            # Sleep until a frame this client hasn't sent yet is published
+            while True:
+                jpeg = latest_jpeg.get(cam_id)
+                if jpeg is not None and jpeg is not last_jpeg:
+                    break
+                frame_ready.wait()
+        last_jpeg = jpeg
+        yield (b'--frame\r\n'
+               b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
 
 @app.route('/')
 def index():
@@ -105,6 +125,7 @@ def video_feed(cam_id):
 
 def run_flask():
     """Runs Flask web server in a separate thread."""
+    pin_thread('WEB_CPUS')  # Keep web serving off the receive core
     app.run(host='0.0.0.0', port=CONFIG['WEB_PORT'], threaded=True)
 
 def main():
@@ -118,6 +139,9 @@ def main():
     # Create TCP server socket
     server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, 'SO_REUSEPORT'):
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)  # Allow extra receiver processes later
+    set_receive_buffer(server, CONFIG['RCVBUF_SIZE'])  # Before listen() so accepted sockets inherit it
     server.bind((CONFIG['HOST'], CONFIG['PORT_STREAM']))
     server.listen(1)
     server.settimeout(10.0)
@@ -127,6 +151,13 @@ def main():
         # Accept connection from Pi
         client, addr = server.accept()
         logging.info(f"Connected to Pi at {addr}")
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Disable Nagle delay
+        if hasattr(socket, 'TCP_QUICKACK'):  # Linux only; ACK immediately instead of delaying
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        enable_busy_poll(client, CONFIG['BUSY_POLL_USEC'])  # Spin on the NIC queue instead of sleeping
+
+        # Run the receive loop on its own core, next to the NIC (see run_xeon_stream.sh)
+        pin_thread('STREAM_CPUS')
 
         # Main receiving loop
         last_frame_time = time.time()
@@ -139,9 +170,13 @@ def main():
             # Apply edge detection
             edges = apply_edge_detection(frame)
 
-            # Update latest frame in memory (thread-safe)
-            with frame_lock:
-                latest_frames[cam_id] = edges
+            # Encode once here so every web client shares the same bytes
+            edges_jpeg = encode_jpeg(edges)
+
+            # Update latest frame in memory (thread-safe) and wake the viewers
+            with frame_ready:
+                latest_jpeg[cam_id] = edges_jpeg
+                frame_ready.notify_all()
             logging.debug(f"Updated edge-detected frame for cam {cam_id}")
 
             # Check for timeout